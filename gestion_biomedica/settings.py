@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',  # Comprime respuestas dinámicas (HTML/JSON)
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,6 +77,35 @@ DATABASES = {
     )
 }
 
+# Pool de conexiones de PostgreSQL (Django 5.1+, psycopg >= 3.1 con el
+# extra 'pool', ver requirements.txt). Se activa con DB_POOL_ENABLE y solo
+# debe usarse con un DATABASE_URL de PostgreSQL: la opción 'pool' solo
+# existe en el backend postgresql, por eso se fija ENGINE. Django no
+# permite pool y conexiones persistentes a la vez, así que CONN_MAX_AGE
+# pasa a 0 (el pool es quien reutiliza las conexiones).
+if os.environ.get('DB_POOL_ENABLE', '').lower() in ('1', 'true', 'yes'):
+    DATABASES['default']['ENGINE'] = 'django.db.backends.postgresql'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        'timeout': 10,
+    }
+
+# Caché local por proceso: cada worker de gunicorn tiene la suya y no se
+# comparten. Solo se usa para datos que toleran estar desactualizados unos
+# segundos (indicadores y bloques del panel, con TTL corto).
+# Las sesiones siguen en la base de datos (motor 'db' por defecto): con
+# 'cached_db' sobre esta caché, un logout solo limpiaría la sesión en el
+# worker que lo atendió y los demás seguirían aceptando la cookie hasta
+# su expiración. Para cachear sesiones hace falta una caché compartida
+# (Redis o DatabaseCache).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -96,6 +126,10 @@ LANGUAGE_CODE = 'es-co'
 
 TIME_ZONE = 'America/Bogota'
 
+# Se mantiene activo: aunque el proyecto no tiene catálogos propios, el
+# admin, los mensajes de validación y los nombres de mes (panel.html usa
+# date:"F") dependen de las traducciones es de Django. No hay
+# LocaleMiddleware, así que no hay negociación de idioma por petición.
 USE_I18N = True
 
 USE_TZ = True
@@ -107,10 +141,20 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 # Configuración de Whitenoise para archivos estáticos
 # En desarrollo (DEBUG=True) usar el storage por defecto para que los
 # archivos estáticos nuevos se sirvan sin ejecutar collectstatic.
+# En producción collectstatic genera variantes .gz y .br (con Brotli
+# instalado) y los archivos con hash se sirven con caché de un año.
+# Django 5.1+ ignora STATICFILES_STORAGE, por eso se usa STORAGES.
 if DEBUG:
-    STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    _STATICFILES_BACKEND = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 else:
-    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    _STATICFILES_BACKEND = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+    WHITENOISE_USE_FINDERS = False
+    WHITENOISE_MAX_AGE = 31536000
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': _STATICFILES_BACKEND},
+}
 
 # Media files (firmas, archivos subidos)
 MEDIA_URL = '/media/'
@@ -5,30 +5,50 @@ Este módulo registra los modelos en el panel de administración,
 permitiendo gestionar los datos desde la interfaz web de Django.
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import RoundEntry, DailySurgeryRecord, Service, Room, Equipment
 
 
+class SinFirmasChangeList(ChangeList):
+    """Listado del admin que no carga las columnas de firma (no se muestran)."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).sin_firmas()
+
+
 @admin.register(RoundEntry)
 class RoundEntryAdmin(admin.ModelAdmin):
     """Administración de registros de rondas"""
     list_display = ['id', 'categoria', 'subservicio', 'usuario', 'fecha_creacion', 'tiene_eventos_seguridad']
     list_filter = ['categoria', 'tiene_eventos_seguridad', 'fecha_creacion']
+    list_select_related = ['usuario']
+    show_facets = admin.ShowFacets.NEVER
     search_fields = ['subservicio', 'hallazgo', 'placa_equipo']
     date_hierarchy = 'fecha_creacion'
     ordering = ['-fecha_creacion']
     readonly_fields = ['fecha_creacion']
 
+    def get_changelist(self, request, **kwargs):
+        return SinFirmasChangeList
+
 
 @admin.register(DailySurgeryRecord)
 class DailySurgeryRecordAdmin(admin.ModelAdmin):
     """Administración de registros diarios de cirugía"""
     list_display = ['id', 'fecha', 'dia_semana', 'sala', 'equipo', 'estado_equipo', 'equipo_en_uso', 'usuario']
-    list_filter = ['fecha', 'dia_semana', 'sala', 'estado_equipo', 'equipo_en_uso']
+    # 'sala' no se filtra en la barra lateral (requiere un SELECT DISTINCT
+    # sobre toda la tabla); se busca con search_fields
+    list_filter = ['fecha', 'dia_semana', 'estado_equipo', 'equipo_en_uso']
+    list_select_related = ['usuario']
+    show_facets = admin.ShowFacets.NEVER
     search_fields = ['sala', 'equipo', 'observaciones']
     date_hierarchy = 'fecha'
     ordering = ['-fecha']
     readonly_fields = ['fecha_creacion']
 
+    def get_changelist(self, request, **kwargs):
+        return SinFirmasChangeList
+
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class RondasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rondas'
+
+    def ready(self):
+        # Precalcular los festivos del año actual y los adyacentes antes
+        # de la primera petición (cálculo en memoria, sin acceso a la BD)
+        from .festivos_colombia import precalcular_festivos
+        precalcular_festivos()
+
+        # Registrar las señales que invalidan la caché de indicadores
+        from . import signals  # noqa: F401
@@ -6,13 +6,26 @@ de datos del historial de rondas en diferentes formatos.
 """
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
 from django.template.loader import render_to_string
 from django.utils import timezone
 from datetime import datetime
+from itertools import chain
+from tempfile import SpooledTemporaryFile
 import os
 
+# WeasyPrint (motor de maquetación en C con Pango/Cairo) es el preferido.
+# Si no está instalado o faltan sus librerías del sistema, al importarlo se
+# lanza OSError; en ese caso se usa xhtml2pdf como respaldo.
+try:
+    from weasyprint import HTML, default_url_fetcher
+    WEASYPRINT_AVAILABLE = True
+except (ImportError, OSError):
+    HTML = None
+    default_url_fetcher = None
+    WEASYPRINT_AVAILABLE = False
+
 try:
     from xhtml2pdf import pisa
     XHTML2PDF_AVAILABLE = True
@@ -21,15 +34,75 @@ except ImportError:
     XHTML2PDF_AVAILABLE = False
 
 try:
-    import openpyxl
-    from openpyxl.styles import Font, Alignment, PatternFill
-    from openpyxl.utils import get_column_letter
+    import xlsxwriter
 except ImportError:
-    openpyxl = None
+    xlsxwriter = None
 
 from .models import RoundEntry, DailySurgeryRecord
 
 
+def _solo_data_uri(url, *args, **kwargs):
+    """
+    url_fetcher de WeasyPrint que solo resuelve URIs `data:`.
+    
+    Las firmas son texto enviado por el usuario y el template las pone
+    directamente en <img src>; cualquier otra URL (http, https, file...)
+    se rechaza para que el PDF no haga peticiones ni lea archivos del
+    servidor. WeasyPrint registra el error y omite esa imagen.
+    """
+    if url[:5].lower() != 'data:':
+        raise ValueError(f'URL no permitida en el PDF: {url[:80]}')
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+# Tamaño a partir del cual el Excel generado se vuelca a disco, y tamaño
+# de cada bloque enviado al cliente
+EXCEL_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXCEL_CHUNK_SIZE = 64 * 1024
+
+# Nombre legible de cada categoría (equivalente a get_categoria_display()
+# para filas obtenidas con values_list)
+CATEGORIA_DISPLAY = dict(RoundEntry.CATEGORIAS)
+
+
+def _fila_servicio(registro):
+    """Fila de Excel para un registro de RoundEntry obtenido con values_list."""
+    return (
+        registro.fecha_creacion.date(),
+        registro.fecha_creacion.time(),
+        registro.usuario__username,
+        CATEGORIA_DISPLAY.get(registro.categoria, registro.categoria),
+        registro.subservicio,
+        'Con eventos' if registro.tiene_eventos_seguridad else 'Sin eventos',
+        'Sí' if registro.fuera_de_servicio else 'No',
+        registro.hallazgo,
+        'Servicio Regular',
+    )
+
+
+def _fila_cirugia(registro):
+    """Fila de Excel para un registro de DailySurgeryRecord obtenido con values_list."""
+    return (
+        registro.fecha if registro.fecha else registro.fecha_creacion.date(),
+        registro.fecha_creacion.time(),
+        registro.usuario__username,
+        'Cirugía',
+        f"Sala {registro.sala} - {registro.equipo}",
+        registro.estado_equipo if registro.estado_equipo else 'No especificado',
+        'Sí' if registro.equipo_en_uso else 'No',
+        registro.observaciones,
+        'Cirugía',
+    )
+
+
+def _leer_por_bloques(archivo, tamaño_bloque=EXCEL_CHUNK_SIZE):
+    """Genera el contenido de un archivo por bloques y lo cierra al terminar."""
+    try:
+        yield from iter(lambda: archivo.read(tamaño_bloque), b'')
+    finally:
+        archivo.close()
+
+
 @login_required
 @permission_required('rondas.delete_roundentry', raise_exception=True)
 def exportar_historial_pdf(request):
@@ -50,39 +123,56 @@ def exportar_historial_pdf(request):
         return redirect('historial_servicios')
     
     # Verificar disponibilidad de librería PDF
-    if not XHTML2PDF_AVAILABLE:
+    if not (WEASYPRINT_AVAILABLE or XHTML2PDF_AVAILABLE):
         messages.error(request, 'La funcionalidad de exportación PDF no está disponible. Por favor contacta al administrador del sistema.')
         return redirect('historial_servicios')
     
     try:
-        # Obtener todos los registros
-        registros_servicios = RoundEntry.objects.select_related("usuario").order_by('-fecha_creacion')
-        registros_cirugias = DailySurgeryRecord.objects.select_related("usuario").order_by('-fecha_creacion')
+        # Obtener todos los registros, solo con las columnas que usa el template
+        # (se omiten, entre otras, las firmas 2 y 3 de Oncología)
+        registros_servicios = RoundEntry.objects.only(
+            'categoria', 'subservicio', 'fecha_creacion', 'hallazgo', 'placa_equipo',
+            'eventos_seguridad', 'fuera_de_servicio',
+            'nombre_encargado_servicio', 'firma_servicio',
+            'nombre_encargado_ronda', 'firma_ronda',
+        ).order_by('-fecha_creacion')
+        registros_cirugias = DailySurgeryRecord.objects.only(
+            'fecha_creacion', 'fecha', 'dia_semana', 'sala', 'equipo', 'equipo_en_uso',
+            'estado_equipo', 'observaciones',
+            'nombre_encargado_servicio', 'firma_servicio',
+            'nombre_encargado_ronda', 'firma_ronda',
+        ).order_by('-fecha_creacion')
         
-        from itertools import chain
-        registros_combinados = list(chain(registros_servicios, registros_cirugias))
-        
-        # Preparar contexto para el template
+        # Preparar contexto para el template. Cada queryset se evalúa una sola
+        # vez al recorrerlo en el template (sin combinarlos en una lista) y los
+        # totales salen de esa misma lista con |length, sin consultas COUNT
         context = {
-            'registros': registros_combinados,
+            'registros_servicios': registros_servicios,
+            'registros_cirugias': registros_cirugias,
             'fecha_generacion': timezone.now(),
             'usuario': request.user
         }
         
         # Renderizar HTML desde template
-        html_string = render_to_string('rondas/pdf_historial.html', context)
+        html_string = render_to_string('rondas/historial_pdf.html', context)
         
         # Crear respuesta HTTP con tipo de contenido PDF
         response = HttpResponse(content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="historial_rondas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf"'
+        # El PDF ya viene comprimido: GZipMiddleware omite las respuestas que
+        # traen Content-Encoding, así no se vuelve a comprimir
+        response['Content-Encoding'] = 'identity'
         
         # Generar PDF desde HTML
-        pisa_status = pisa.CreatePDF(html_string, dest=response)
-        
-        # Verificar errores en la generación
-        if pisa_status.err:
-            messages.error(request, 'Error al generar el PDF. Por favor intenta nuevamente.')
-            return redirect('historial_servicios')
+        if WEASYPRINT_AVAILABLE:
+            HTML(string=html_string, url_fetcher=_solo_data_uri).write_pdf(target=response)
+        else:
+            pisa_status = pisa.CreatePDF(html_string, dest=response)
+            
+            # Verificar errores en la generación
+            if pisa_status.err:
+                messages.error(request, 'Error al generar el PDF. Por favor intenta nuevamente.')
+                return redirect('historial_servicios')
         
         return response
         
@@ -112,15 +202,17 @@ def exportar_historial_excel(request):
         return redirect('historial_servicios')
     
     # Verificar disponibilidad de librería Excel
-    if not openpyxl:
+    if not xlsxwriter:
         messages.error(request, 'La funcionalidad de exportación Excel no está disponible. Por favor contacta al administrador del sistema.')
         return redirect('historial_servicios')
     
     try:
-        # Crear nuevo libro de Excel
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
-        worksheet.title = "Historial Rondas"
+        # Crear nuevo libro de Excel en un temporal que solo pasa a disco si
+        # supera EXCEL_SPOOL_MAX_SIZE. Con constant_memory cada fila se
+        # serializa al escribirse y no se conserva en memoria.
+        archivo_temporal = SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE)
+        workbook = xlsxwriter.Workbook(archivo_temporal, {'constant_memory': True})
+        worksheet = workbook.add_worksheet("Historial Rondas")
         
         # Definir encabezados
         headers = [
@@ -129,68 +221,67 @@ def exportar_historial_excel(request):
         ]
         
         # Escribir encabezados con formato
-        header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        header_font = Font(bold=True, color='FFFFFF', size=12)
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = worksheet.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Obtener todos los registros
-        registros_servicios = RoundEntry.objects.select_related("usuario").order_by('-fecha_creacion')
-        registros_cirugias = DailySurgeryRecord.objects.select_related("usuario").order_by('-fecha_creacion')
-        
-        # Escribir datos de servicios
-        row_num = 2
-        for registro in registros_servicios:
-            worksheet.cell(row=row_num, column=1).value = registro.fecha_creacion.strftime('%Y-%m-%d')
-            worksheet.cell(row=row_num, column=2).value = registro.fecha_creacion.strftime('%H:%M:%S')
-            worksheet.cell(row=row_num, column=3).value = registro.usuario.username
-            worksheet.cell(row=row_num, column=4).value = registro.get_categoria_display()
-            worksheet.cell(row=row_num, column=5).value = registro.subservicio
-            worksheet.cell(row=row_num, column=6).value = 'Con eventos' if registro.tiene_eventos_seguridad else 'Sin eventos'
-            worksheet.cell(row=row_num, column=7).value = 'Sí' if registro.fuera_de_servicio else 'No'
-            worksheet.cell(row=row_num, column=8).value = registro.hallazgo
-            worksheet.cell(row=row_num, column=9).value = 'Servicio Regular'
-            row_num += 1
+        header_format = workbook.add_format({
+            'bold': True, 'font_color': 'white', 'font_size': 12,
+            'bg_color': '#366092', 'align': 'center', 'valign': 'vcenter',
+        })
+        worksheet.write_row(0, 0, headers, header_format)
         
-        # Escribir datos de cirugías
-        for registro in registros_cirugias:
-            worksheet.cell(row=row_num, column=1).value = registro.fecha.strftime('%Y-%m-%d') if registro.fecha else registro.fecha_creacion.strftime('%Y-%m-%d')
-            worksheet.cell(row=row_num, column=2).value = registro.fecha_creacion.strftime('%H:%M:%S')
-            worksheet.cell(row=row_num, column=3).value = registro.usuario.username
-            worksheet.cell(row=row_num, column=4).value = 'Cirugía'
-            worksheet.cell(row=row_num, column=5).value = f"Sala {registro.sala} - {registro.equipo}"
-            worksheet.cell(row=row_num, column=6).value = registro.estado_equipo if registro.estado_equipo else 'No especificado'
-            worksheet.cell(row=row_num, column=7).value = 'Sí' if registro.equipo_en_uso else 'No'
-            worksheet.cell(row=row_num, column=8).value = registro.observaciones
-            worksheet.cell(row=row_num, column=9).value = 'Cirugía'
+        # Fecha y hora se escriben como valores nativos de Excel con formato
+        # de número, en lugar de convertirlas a texto fila por fila
+        fecha_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+        hora_format = workbook.add_format({'num_format': 'hh:mm:ss'})
+        
+        # Obtener solo las columnas exportadas, como tuplas con nombre y
+        # recorriendo el cursor por bloques en lugar de cargar modelos completos
+        registros_servicios = RoundEntry.objects.order_by('-fecha_creacion').values_list(
+            'fecha_creacion', 'usuario__username', 'categoria', 'subservicio',
+            'tiene_eventos_seguridad', 'fuera_de_servicio', 'hallazgo',
+            named=True,
+        ).iterator(chunk_size=2000)
+        registros_cirugias = DailySurgeryRecord.objects.order_by('-fecha_creacion').values_list(
+            'fecha', 'fecha_creacion', 'usuario__username', 'sala', 'equipo',
+            'estado_equipo', 'equipo_en_uso', 'observaciones',
+            named=True,
+        ).iterator(chunk_size=2000)
+        
+        # Ancho máximo por columna, calculado mientras se escriben las filas.
+        # Fecha y hora tienen ancho fijo según su formato.
+        max_len = [len(header) for header in headers]
+        max_len[0] = max(max_len[0], len('YYYY-MM-DD'))
+        max_len[1] = max(max_len[1], len('HH:MM:SS'))
+        row_num = 1
+        
+        # Escribir datos de servicios y luego de cirugías
+        filas = chain(
+            map(_fila_servicio, registros_servicios),
+            map(_fila_cirugia, registros_cirugias),
+        )
+        for fecha, hora, *valores in filas:
+            worksheet.write_datetime(row_num, 0, fecha, fecha_format)
+            worksheet.write_datetime(row_num, 1, hora, hora_format)
+            worksheet.write_row(row_num, 2, valores)
+            for i, valor in enumerate(valores, 2):
+                if valor is not None:
+                    max_len[i] = max(max_len[i], len(str(valor)))
             row_num += 1
         
-        # Ajustar ancho de columnas automáticamente
-        for col_num in range(1, len(headers) + 1):
-            column_letter = get_column_letter(col_num)
-            max_length = 0
-            for cell in worksheet[column_letter]:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        # Ajustar ancho de columnas (xlsxwriter lo aplica al cerrar el libro)
+        for col_num, longitud in enumerate(max_len):
+            worksheet.set_column(col_num, col_num, min(longitud + 2, 50))
+        
+        workbook.close()
+        archivo_temporal.seek(0)
         
         # Preparar respuesta HTTP
-        response = HttpResponse(
+        response = StreamingHttpResponse(
+            _leer_por_bloques(archivo_temporal),
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
         response['Content-Disposition'] = f'attachment; filename="historial_rondas_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx"'
-        
-        # Guardar el archivo Excel en la respuesta
-        workbook.save(response)
+        # El .xlsx ya es un ZIP: sin esta cabecera GZipMiddleware comprimiría
+        # de nuevo toda respuesta en streaming
+        response['Content-Encoding'] = 'identity'
         
         return response
         
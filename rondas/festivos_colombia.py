@@ -2,7 +2,13 @@
 Módulo para manejo de días festivos en Colombia
 """
 from datetime import datetime, date, timedelta
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+
+# Festivos ya calculados por año. El año actual y los adyacentes se
+# precalculan al iniciar la aplicación (ver precalcular_festivos).
+_FESTIVOS_CACHE: Dict[int, FrozenSet[date]] = {}
 
 
 class FestivosColombiaCalculator:
@@ -40,7 +46,22 @@ class FestivosColombiaCalculator:
         (11, 11), # Independencia de Cartagena - 11 de noviembre
     ]
 
+    # Meses en los que puede caer algún festivo (fijos, trasladados y los
+    # que dependen de Pascua). Febrero y septiembre nunca tienen festivos.
+    _MESES_CON_FESTIVO = frozenset({1, 3, 4, 5, 6, 7, 8, 10, 11, 12})
+
+    @staticmethod
+    def _trasladar_a_lunes(fecha: date) -> date:
+        """
+        Traslada una fecha al lunes siguiente (Ley Emiliani).
+
+        Si la fecha ya es lunes se conserva; `(-weekday) % 7` da los días
+        que faltan hasta el próximo lunes sin necesidad de condicionales.
+        """
+        return fecha + timedelta(days=(-fecha.weekday()) % 7)
+
     @staticmethod
+    @lru_cache(maxsize=32)
     def calcular_domingo_pascua(año: int) -> date:
         """
         Calcula la fecha del Domingo de Pascua usando el algoritmo de Gauss.
@@ -75,9 +96,29 @@ class FestivosColombiaCalculator:
         return date(año, n, p + 1)
 
     @classmethod
-    def obtener_festivos_año(cls, año: int) -> List[date]:
+    def obtener_festivos_año(cls, año: int) -> FrozenSet[date]:
         """
-        Obtiene todos los días festivos para un año específico
+        Obtiene todos los días festivos para un año específico.
+
+        El resultado se guarda en `_FESTIVOS_CACHE` y se devuelve como
+        frozenset para que la verificación `fecha in festivos` sea O(1).
+        """
+        return cls._get_cached(año)
+
+    @classmethod
+    def _get_cached(cls, año: int) -> FrozenSet[date]:
+        """
+        Devuelve los festivos del año desde la caché, calculándolos si faltan
+        """
+        festivos = _FESTIVOS_CACHE.get(año)
+        if festivos is None:
+            festivos = _FESTIVOS_CACHE[año] = cls._calcular_festivos_año(año)
+        return festivos
+
+    @classmethod
+    def _calcular_festivos_año(cls, año: int) -> FrozenSet[date]:
+        """
+        Calcula todos los días festivos de un año (sin caché)
         """
         festivos = []
         
@@ -87,16 +128,7 @@ class FestivosColombiaCalculator:
         
         # Festivos trasladables al lunes
         for mes, dia in cls.FESTIVOS_TRASLADABLES:
-            fecha_original = date(año, mes, dia)
-            # Si no es lunes, trasladar al siguiente lunes
-            if fecha_original.weekday() != 0:  # 0 = lunes
-                dias_hasta_lunes = (7 - fecha_original.weekday()) % 7
-                if dias_hasta_lunes == 0:
-                    dias_hasta_lunes = 7
-                fecha_festivo = fecha_original + timedelta(days=dias_hasta_lunes)
-            else:
-                fecha_festivo = fecha_original
-            festivos.append(fecha_festivo)
+            festivos.append(cls._trasladar_a_lunes(date(año, mes, dia)))
         
         # Festivos relacionados con la Pascua
         domingo_pascua = cls.calcular_domingo_pascua(año)
@@ -110,33 +142,22 @@ class FestivosColombiaCalculator:
         festivos.append(viernes_santo)
         
         # Ascensión del Señor (39 días después de pascua, trasladado al lunes)
-        ascension = domingo_pascua + timedelta(days=39)
-        if ascension.weekday() != 0:  # Si no es lunes
-            dias_hasta_lunes = (7 - ascension.weekday()) % 7
-            if dias_hasta_lunes == 0:
-                dias_hasta_lunes = 7
-            ascension = ascension + timedelta(days=dias_hasta_lunes)
-        festivos.append(ascension)
+        festivos.append(cls._trasladar_a_lunes(domingo_pascua + timedelta(days=39)))
         
         # Corpus Christi (60 días después de pascua, trasladado al lunes)
-        corpus_christi = domingo_pascua + timedelta(days=60)
-        if corpus_christi.weekday() != 0:  # Si no es lunes
-            dias_hasta_lunes = (7 - corpus_christi.weekday()) % 7
-            if dias_hasta_lunes == 0:
-                dias_hasta_lunes = 7
-            corpus_christi = corpus_christi + timedelta(days=dias_hasta_lunes)
-        festivos.append(corpus_christi)
+        festivos.append(cls._trasladar_a_lunes(domingo_pascua + timedelta(days=60)))
         
         # Sagrado Corazón de Jesús (68 días después de pascua, trasladado al lunes)
-        sagrado_corazon = domingo_pascua + timedelta(days=68)
-        if sagrado_corazon.weekday() != 0:  # Si no es lunes
-            dias_hasta_lunes = (7 - sagrado_corazon.weekday()) % 7
-            if dias_hasta_lunes == 0:
-                dias_hasta_lunes = 7
-            sagrado_corazon = sagrado_corazon + timedelta(days=dias_hasta_lunes)
-        festivos.append(sagrado_corazon)
+        festivos.append(cls._trasladar_a_lunes(domingo_pascua + timedelta(days=68)))
         
-        return sorted(festivos)
+        return frozenset(festivos)
+
+    @classmethod
+    def obtener_festivos_año_ordenados(cls, año: int) -> List[date]:
+        """
+        Obtiene los días festivos de un año ordenados cronológicamente
+        """
+        return sorted(cls.obtener_festivos_año(año))
 
     @classmethod
     def es_festivo(cls, fecha: date) -> bool:
@@ -149,7 +170,11 @@ class FestivosColombiaCalculator:
         Returns:
             True si es festivo, False si es día hábil
         """
-        festivos_año = cls.obtener_festivos_año(fecha.year)
+        if fecha.month not in cls._MESES_CON_FESTIVO:
+            return False
+        festivos_año = _FESTIVOS_CACHE.get(fecha.year)
+        if festivos_año is None:
+            festivos_año = cls._get_cached(fecha.year)
         return fecha in festivos_año
 
     @classmethod
@@ -166,13 +191,19 @@ class FestivosColombiaCalculator:
         Returns:
             Fecha del siguiente día hábil
         """
-        siguiente_dia = fecha
+        # Saltar directamente al siguiente día de lunes a viernes:
+        # de lunes a jueves es el día siguiente; de viernes a domingo, el lunes
+        dia_semana = fecha.weekday()
+        siguiente_dia = fecha + timedelta(days=1 if dia_semana < 4 else 7 - dia_semana)
         
-        while True:
+        # Avanzar mientras sea festivo o fin de semana (sábado=5, domingo=6)
+        año = siguiente_dia.year
+        festivos_año = cls._get_cached(año)
+        while siguiente_dia in festivos_año or siguiente_dia.weekday() >= 5:
             siguiente_dia += timedelta(days=1)
-            # Verificar: no es fin de semana (sábado=5, domingo=6) y no es festivo
-            if siguiente_dia.weekday() < 5 and not cls.es_festivo(siguiente_dia):
-                break
+            if siguiente_dia.year != año:  # Cambio de año: usar sus festivos
+                año = siguiente_dia.year
+                festivos_año = cls._get_cached(año)
                 
         return siguiente_dia
 
@@ -249,6 +280,17 @@ def obtener_dia_rondas(fecha: date = None) -> Tuple[date, bool]:
     if fecha is None:
         fecha = date.today()
     
+    return _dia_rondas(fecha)
+
+
+@lru_cache(maxsize=730)
+def _dia_rondas(fecha: date) -> Tuple[date, bool]:
+    """
+    Versión memorizada de ajustar_dia_rondas, indexada por fecha concreta.
+    
+    El resultado solo depende de la fecha, así que cada proceso lo calcula
+    una vez por día (730 entradas cubren unos dos años de fechas).
+    """
     return FestivosColombiaCalculator.ajustar_dia_rondas(fecha)
 
 
@@ -256,10 +298,28 @@ def obtener_festivos_mes(año: int, mes: int) -> List[date]:
     """
     Obtiene todos los festivos de un mes específico
     """
-    festivos_año = FestivosColombiaCalculator.obtener_festivos_año(año)
+    festivos_año = FestivosColombiaCalculator.obtener_festivos_año_ordenados(año)
     return [f for f in festivos_año if f.month == mes]
 
 
+
+def precalcular_festivos(fecha: date = None) -> None:
+    """
+    Llena la caché de festivos para el año de la fecha dada y los adyacentes.
+    
+    Se ejecuta al iniciar la aplicación (RondasConfig.ready) para que la
+    primera petición de cada proceso no pague el cálculo.
+    
+    Args:
+        fecha: Fecha de referencia. Si es None, usa la fecha actual.
+    """
+    if fecha is None:
+        fecha = date.today()
+    
+    for año in (fecha.year - 1, fecha.year, fecha.year + 1):
+        FestivosColombiaCalculator._get_cached(año)
+
+
 if __name__ == "__main__":
     # Ejemplo de uso
     hoy = date.today()
@@ -272,7 +332,7 @@ if __name__ == "__main__":
         print(f"Las rondas son hoy: {dia_rondas}")
     
     # Mostrar festivos del año actual
-    festivos = FestivosColombiaCalculator.obtener_festivos_año(hoy.year)
+    festivos = FestivosColombiaCalculator.obtener_festivos_año_ordenados(hoy.year)
     print(f"\nFestivos {hoy.year}:")
     for festivo in festivos:
         print(f"  {festivo.strftime('%A, %d de %B')}")
\ No newline at end of file
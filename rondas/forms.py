@@ -1,9 +1,35 @@
-﻿import json
+﻿import copy
+import json
 from django import forms
 
 from .models import RoundEntry, DailySurgeryRecord
 
 
+# Atributos, opciones y widgets compartidos por los formularios. Django copia
+# cada widget al construir el campo, así que es seguro reutilizar instancias.
+_FORM_CONTROL = {"class": "form-control"}
+_YESNO_CHOICES = ((True, 'Sí'), (False, 'No'))
+_TEXT_INPUT = forms.TextInput(attrs=_FORM_CONTROL)
+_HIDDEN_TEXT_INPUT = forms.TextInput(attrs={"type": "hidden"})
+_YESNO_RADIO = forms.RadioSelect(choices=_YESNO_CHOICES)
+
+# Widgets comunes a RoundEntryForm y OncologyRoundEntryForm
+_ROUND_ENTRY_WIDGETS = {
+    "categoria": forms.HiddenInput(),
+    "subservicio": forms.HiddenInput(),
+    "hallazgo": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
+    "placa_equipo": _TEXT_INPUT,
+    "orden_trabajo": _TEXT_INPUT,
+    "tiene_eventos_seguridad": _YESNO_RADIO,
+    "eventos_seguridad": forms.Textarea(attrs={"rows": 2, "class": "form-control", "disabled": True}),
+    "fuera_de_servicio": _TEXT_INPUT,
+    "nombre_encargado_servicio": _TEXT_INPUT,
+    "firma_servicio": _HIDDEN_TEXT_INPUT,
+    "nombre_encargado_ronda": _TEXT_INPUT,
+    "firma_ronda": _HIDDEN_TEXT_INPUT,
+}
+
+
 class RoundEntryForm(forms.ModelForm):
     """Form para crear/editar registros de ronda."""
     
@@ -23,20 +49,7 @@ class RoundEntryForm(forms.ModelForm):
             "nombre_encargado_ronda",
             "firma_ronda",
         ]
-        widgets = {
-            "categoria": forms.HiddenInput(),
-            "subservicio": forms.HiddenInput(),
-            "hallazgo": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
-            "placa_equipo": forms.TextInput(attrs={"class": "form-control"}),
-            "orden_trabajo": forms.TextInput(attrs={"class": "form-control"}),
-            "tiene_eventos_seguridad": forms.RadioSelect(choices=[(True, 'Sí'), (False, 'No')]),
-            "eventos_seguridad": forms.Textarea(attrs={"rows": 2, "class": "form-control", "disabled": True}),
-            "fuera_de_servicio": forms.TextInput(attrs={"class": "form-control"}),
-            "nombre_encargado_servicio": forms.TextInput(attrs={"class": "form-control"}),
-            "firma_servicio": forms.TextInput(attrs={"type": "hidden"}),
-            "nombre_encargado_ronda": forms.TextInput(attrs={"class": "form-control"}),
-            "firma_ronda": forms.TextInput(attrs={"type": "hidden"}),
-        }
+        widgets = _ROUND_ENTRY_WIDGETS
 
     def clean(self):
         """Validación adicional del formulario."""
@@ -77,22 +90,12 @@ class OncologyRoundEntryForm(forms.ModelForm):
             "firma_ronda",
         ]
         widgets = {
-            "categoria": forms.HiddenInput(),
-            "subservicio": forms.HiddenInput(),
-            "hallazgo": forms.Textarea(attrs={"rows": 3, "class": "form-control"}),
-            "placa_equipo": forms.TextInput(attrs={"class": "form-control"}),
-            "orden_trabajo": forms.TextInput(attrs={"class": "form-control"}),
-            "tiene_eventos_seguridad": forms.RadioSelect(choices=[(True, 'Sí'), (False, 'No')]),
-            "eventos_seguridad": forms.Textarea(attrs={"rows": 2, "class": "form-control", "disabled": True}),
-            "fuera_de_servicio": forms.TextInput(attrs={"class": "form-control"}),
+            **_ROUND_ENTRY_WIDGETS,
             "nombre_encargado_servicio": forms.TextInput(attrs={"class": "form-control", "placeholder": "Personal del servicio 1"}),
-            "firma_servicio": forms.TextInput(attrs={"type": "hidden"}),
             "nombre_encargado_servicio_2": forms.TextInput(attrs={"class": "form-control", "placeholder": "Personal del servicio 2"}),
-            "firma_servicio_2": forms.TextInput(attrs={"type": "hidden"}),
+            "firma_servicio_2": _HIDDEN_TEXT_INPUT,
             "nombre_encargado_servicio_3": forms.TextInput(attrs={"class": "form-control", "placeholder": "Personal del servicio 3"}),
-            "firma_servicio_3": forms.TextInput(attrs={"type": "hidden"}),
-            "nombre_encargado_ronda": forms.TextInput(attrs={"class": "form-control"}),
-            "firma_ronda": forms.TextInput(attrs={"type": "hidden"}),
+            "firma_servicio_3": _HIDDEN_TEXT_INPUT,
         }
 
     def clean(self):
@@ -146,8 +149,8 @@ class DailySurgeryRoundForm(forms.ModelForm):
             "equipo_en_uso": forms.CheckboxInput(attrs={"class": "form-check-input", "onchange": "toggleEquipoFields(this)"}),
             "estado_equipo": forms.Select(attrs={"class": "form-select"}),
             "observaciones": forms.Textarea(attrs={"class": "form-control", "rows": 3}),
-            "nombre_encargado_servicio": forms.TextInput(attrs={"class": "form-control"}),
-            "nombre_encargado_ronda": forms.TextInput(attrs={"class": "form-control"}),
+            "nombre_encargado_servicio": _TEXT_INPUT,
+            "nombre_encargado_ronda": _TEXT_INPUT,
             "firma_servicio": forms.HiddenInput(),
             "firma_ronda": forms.HiddenInput(),
         }
@@ -171,3 +174,28 @@ class DailySurgeryRoundForm(forms.ModelForm):
                 self.add_error('nombre_encargado_ronda', "Debe ingresar el nombre del encargado de la ronda.")
         
         return cleaned_data
+
+
+# Prototipo de cada clase de formulario para formulario_sin_datos
+_PROTOTIPOS = {}
+
+
+def formulario_sin_datos(form_class, initial):
+    """
+    Devuelve un formulario sin datos enviados, solo con valores iniciales.
+    
+    Construir un formulario copia en profundidad todos sus campos y widgets,
+    y el panel muestra decenas de formularios por petición. Aquí se construye
+    un prototipo por clase y cada formulario es una copia superficial que
+    comparte los campos del prototipo y solo cambia `initial`.
+    
+    Solo para formularios que se muestran; no usar si se van a enlazar con
+    datos o si se modifican sus `fields`.
+    """
+    prototipo = _PROTOTIPOS.get(form_class)
+    if prototipo is None:
+        prototipo = _PROTOTIPOS[form_class] = form_class()
+    form = copy.copy(prototipo)
+    form.initial = {**prototipo.initial, **initial}
+    form._bound_fields_cache = {}
+    return form
@@ -5,8 +5,19 @@ Este módulo contiene funciones helper que son utilizadas
 en diferentes partes del sistema de rondas.
 """
 from datetime import datetime
+from functools import lru_cache
 
+from django.db.models import Q
 
+from .utils import ONCOLOGY_SERVICES, SURGERY_AVAILABLE_DAYS, get_services_for_day
+
+# Horario diurno de las rondas (5:00 AM a 6:00 PM): rige el registro en el
+# panel y las rondas que se muestran en el historial
+HORA_INICIO = 5
+HORA_FIN = 18
+
+
+@lru_cache(maxsize=128)
 def is_oncology_service(servicio):
     """
     Verifica si un servicio pertenece a oncología.
@@ -26,7 +37,7 @@ def is_oncology_service(servicio):
         >>> is_oncology_service("Urgencias")
         False
     """
-    return servicio.lower() in ["oncología", "hemato-oncología", "oncologia", "hemato-oncologia"]
+    return servicio.lower() in ONCOLOGY_SERVICES
 
 
 def horario_valido_panel(moment) -> bool:
@@ -50,24 +61,23 @@ def horario_valido_panel(moment) -> bool:
         False
     """
     hora = moment.hour
-    return 5 <= hora < 18
+    return HORA_INICIO <= hora < HORA_FIN
 
 
-def horario_visible_historial(fecha_creacion) -> bool:
+def filtro_horario_historial() -> Q:
     """
-    Valida si una ronda debe mostrarse en el historial.
+    Filtro de las rondas que se muestran en el historial.
     
-    El historial filtra y muestra únicamente las rondas registradas
-    durante el horario establecido (5:00 AM a 6:00 PM).
+    El historial muestra únicamente las rondas registradas durante el
+    horario establecido (5:00 AM a 6:00 PM). Django extrae la hora de
+    `fecha_creacion` en la zona horaria activa (TIME_ZONE), igual que
+    timezone.localtime(), así que el filtro se resuelve en la base de
+    datos sin traer todas las filas.
     
-    Args:
-        fecha_creacion (datetime): Fecha de creación del registro
-        
     Returns:
-        bool: True si debe mostrarse en el historial, False en caso contrario
+        Q: Filtro por hora de creación entre HORA_INICIO y HORA_FIN
     """
-    hora = fecha_creacion.hour
-    return 5 <= hora < 18
+    return Q(fecha_creacion__hour__gte=HORA_INICIO, fecha_creacion__hour__lt=HORA_FIN)
 
 
 def surgery_available_today(day_number):
@@ -86,7 +96,6 @@ def surgery_available_today(day_number):
         >>> surgery_available_today(6)  # Domingo
         False
     """
-    from .utils import SURGERY_AVAILABLE_DAYS
     return day_number in SURGERY_AVAILABLE_DAYS
 
 
@@ -108,5 +117,4 @@ def get_services_by_day(day_number):
         >>> print(servicios["ronda_diaria"])
         ["Urgencias", "Salud Mental", "Trasplante de Médula"]
     """
-    from .utils import get_services_for_day
     return get_services_for_day(day_number)
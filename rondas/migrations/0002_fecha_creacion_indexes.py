@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-15 01:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rondas', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailysurgeryrecord',
+            index=models.Index(fields=['-fecha_creacion'], name='rondas_dail_fecha_c_04a9f1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roundentry',
+            index=models.Index(fields=['-fecha_creacion'], name='rondas_roun_fecha_c_49a6bd_idx'),
+        ),
+    ]
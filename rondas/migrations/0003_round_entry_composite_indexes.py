@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-15 01:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rondas', '0002_fecha_creacion_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='roundentry',
+            index=models.Index(fields=['categoria', '-fecha_creacion'], name='rondas_roun_categor_091b99_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roundentry',
+            index=models.Index(fields=['usuario', '-fecha_creacion'], name='rondas_roun_usuario_53e984_idx'),
+        ),
+    ]
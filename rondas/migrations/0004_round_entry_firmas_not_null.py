@@ -0,0 +1,55 @@
+# Generated by Django 5.2.6 on 2026-10-15 01:59
+
+from django.db import migrations, models
+
+
+CAMPOS_FIRMA = ('firma_servicio', 'firma_servicio_2', 'firma_servicio_3', 'firma_ronda')
+
+
+def firmas_nulas_a_vacio(apps, schema_editor):
+    """
+    Reemplaza NULL por cadena vacía antes de volver NOT NULL las columnas.
+    
+    El default='' de los AlterField siguientes es el valor de las filas
+    nuevas; este paso es el único relleno de las existentes. Se hace
+    explícito para no depender de cómo cada backend (PostgreSQL, SQLite,
+    mssql-django) trata los NULL al cambiar la columna a NOT NULL.
+    
+    La reversa es noop a propósito: tras el cambio no se puede distinguir
+    qué cadenas vacías eran NULL, y el AlterField inverso ya vuelve a
+    permitir NULL en las columnas.
+    """
+    RoundEntry = apps.get_model('rondas', 'RoundEntry')
+    for campo in CAMPOS_FIRMA:
+        RoundEntry.objects.filter(**{f'{campo}__isnull': True}).update(**{campo: ''})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rondas', '0003_round_entry_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(firmas_nulas_a_vacio, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='roundentry',
+            name='firma_ronda',
+            field=models.TextField(blank=True, default='', verbose_name='Firma del encargado de la ronda'),
+        ),
+        migrations.AlterField(
+            model_name='roundentry',
+            name='firma_servicio',
+            field=models.TextField(blank=True, default='', verbose_name='Firma del encargado del servicio'),
+        ),
+        migrations.AlterField(
+            model_name='roundentry',
+            name='firma_servicio_2',
+            field=models.TextField(blank=True, default='', verbose_name='Firma del encargado del servicio 2'),
+        ),
+        migrations.AlterField(
+            model_name='roundentry',
+            name='firma_servicio_3',
+            field=models.TextField(blank=True, default='', verbose_name='Firma del encargado del servicio 3'),
+        ),
+    ]
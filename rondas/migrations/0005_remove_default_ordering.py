@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-15 02:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rondas', '0004_round_entry_firmas_not_null'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='dailysurgeryrecord',
+            options={'verbose_name': 'Registro Diario de Cirugía', 'verbose_name_plural': 'Registros Diarios de Cirugía'},
+        ),
+        migrations.AlterModelOptions(
+            name='roundentry',
+            options={'verbose_name': 'Registro de ronda', 'verbose_name_plural': 'Registros de rondas'},
+        ),
+    ]
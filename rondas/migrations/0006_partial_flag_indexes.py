@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-15 02:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rondas', '0005_remove_default_ordering'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='roundentry',
+            index=models.Index(condition=models.Q(('fuera_de_servicio', True)), fields=['subservicio', 'categoria'], name='rondas_roun_fuera_servicio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roundentry',
+            index=models.Index(condition=models.Q(('tiene_eventos_seguridad', True)), fields=['subservicio', 'categoria'], name='rondas_roun_eventos_seg_idx'),
+        ),
+    ]
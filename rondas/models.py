@@ -1,5 +1,45 @@
-﻿from django.conf import settings
+﻿import json
+
+from django.conf import settings
 from django.db import models
+from django.utils.functional import cached_property
+
+
+def _firmas_jefes(firma_servicio):
+    """
+    Interpreta `firma_servicio` como lista JSON de firmas de jefes.
+    
+    Oncología/CJO guardan hasta 4 firmas de jefes en `firma_servicio` como
+    JSON (lista de dicts {"name": ..., "img": ...}). Para cualquier otro
+    valor (firma base64 simple, vacío o JSON inválido) devuelve None.
+    """
+    if not firma_servicio or not firma_servicio.lstrip().startswith('['):
+        return None
+    try:
+        parsed = json.loads(firma_servicio)
+    except ValueError:
+        return None
+    if isinstance(parsed, list) and parsed:
+        # Cada item esperado: {'name': 'Jefe 1', 'img': 'data:image/png;base64,...'}
+        return parsed[:4]
+    return None
+
+
+class RegistroQuerySet(models.QuerySet):
+    """QuerySet para registros con firmas digitales almacenadas como texto."""
+
+    def sin_firmas(self):
+        """
+        Omite las columnas de firma (imágenes base64 de varios KB cada una).
+        
+        Para listados y operaciones que no muestran las firmas; si se accede
+        a una firma en un objeto obtenido así, Django la consulta aparte.
+        """
+        campos_firma = [
+            campo.name for campo in self.model._meta.concrete_fields
+            if campo.name.startswith("firma_")
+        ]
+        return self.defer(*campos_firma)
 
 
 class RoundEntry(models.Model):
@@ -13,7 +53,7 @@ class RoundEntry(models.Model):
     - Registra hallazgos y eventos de seguridad
     - Captura firmas digitales del personal (hasta 3 para Oncología)
     - Asociado a un usuario autenticado
-    - Ordenado por fecha de creación descendente
+    - Los listados se ordenan por fecha de creación descendente
     """
 
     # Categorías de servicios hospitalarios
@@ -49,29 +89,54 @@ class RoundEntry(models.Model):
     fuera_de_servicio = models.BooleanField(default=False, verbose_name="¿Equipo fuera de servicio?")
     # Firma del encargado del servicio (firma 1 - obligatoria)
     nombre_encargado_servicio = models.CharField(max_length=100, default='Sin especificar')
-    firma_servicio = models.TextField(blank=True, null=True, verbose_name="Firma del encargado del servicio")
+    firma_servicio = models.TextField(blank=True, default='', verbose_name="Firma del encargado del servicio")
     
     # Campos adicionales para servicios con múltiples encargados (ej: Oncología con 3 pisos)
     nombre_encargado_servicio_2 = models.CharField(max_length=100, blank=True, default='')
-    firma_servicio_2 = models.TextField(blank=True, null=True, verbose_name="Firma del encargado del servicio 2")
+    firma_servicio_2 = models.TextField(blank=True, default='', verbose_name="Firma del encargado del servicio 2")
     nombre_encargado_servicio_3 = models.CharField(max_length=100, blank=True, default='')
-    firma_servicio_3 = models.TextField(blank=True, null=True, verbose_name="Firma del encargado del servicio 3")
+    firma_servicio_3 = models.TextField(blank=True, default='', verbose_name="Firma del encargado del servicio 3")
     
     # Firma del tecnólogo o supervisor que realiza la ronda (obligatoria)
     nombre_encargado_ronda = models.CharField(max_length=100, default='Sin especificar')
-    firma_ronda = models.TextField(blank=True, null=True, verbose_name="Firma del encargado de la ronda")
+    firma_ronda = models.TextField(blank=True, default='', verbose_name="Firma del encargado de la ronda")
     
     # Metadata
     fecha_creacion = models.DateTimeField(auto_now_add=True)  # Fecha y hora de registro automática
 
+    objects = RegistroQuerySet.as_manager()
+
     class Meta:
-        ordering = ["-fecha_creacion"]
+        # Sin ordering por defecto: así count(), exists() y las agregaciones
+        # no arrastran un ORDER BY; los listados ordenan explícitamente
         verbose_name = "Registro de ronda"
         verbose_name_plural = "Registros de rondas"
+        indexes = [
+            models.Index(fields=["-fecha_creacion"]),  # Orden del historial y exportaciones
+            models.Index(fields=["categoria", "-fecha_creacion"]),  # Historial filtrado por categoría
+            models.Index(fields=["usuario", "-fecha_creacion"]),  # Registros de un usuario, recientes primero
+            # Índices parciales para los indicadores: solo contienen las filas
+            # marcadas (pocas) y cubren la agrupación de los top 5 por servicio
+            models.Index(
+                fields=["subservicio", "categoria"],
+                name="rondas_roun_fuera_servicio_idx",
+                condition=models.Q(fuera_de_servicio=True),
+            ),
+            models.Index(
+                fields=["subservicio", "categoria"],
+                name="rondas_roun_eventos_seg_idx",
+                condition=models.Q(tiene_eventos_seguridad=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_categoria_display()} - {self.subservicio}"
 
+    @cached_property
+    def jefe_firmas(self):
+        """Firmas de jefes guardadas como JSON en firma_servicio (o None)."""
+        return _firmas_jefes(self.firma_servicio)
+
 
 # NOTA: Modelo SurgeryRound ELIMINADO - Consolidado en DailySurgeryRecord
 # Los registros semanales ahora se manejan como múltiples registros diarios
@@ -223,11 +288,20 @@ class DailySurgeryRecord(models.Model):
     firma_servicio = models.TextField(blank=True, verbose_name="Firma del encargado del servicio")
     firma_ronda = models.TextField(blank=True, verbose_name="Firma del encargado de la ronda")
     
+    objects = RegistroQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Registro Diario de Cirugía"
         verbose_name_plural = "Registros Diarios de Cirugía"
         unique_together = [["fecha", "sala", "equipo"]]  # Un registro por día, sala y equipo
-        ordering = ["-fecha_creacion"]
+        indexes = [
+            models.Index(fields=["-fecha_creacion"]),  # Orden del historial y exportaciones
+        ]
     
     def __str__(self):
         return f"{self.fecha} - Sala {self.sala} - {self.equipo}"
+    
+    @cached_property
+    def jefe_firmas(self):
+        """Firmas de jefes guardadas como JSON en firma_servicio (o None)."""
+        return _firmas_jefes(self.firma_servicio)
@@ -0,0 +1,23 @@
+"""
+Señales del módulo de rondas.
+
+Invalidan los indicadores guardados en caché cada vez que se crea,
+modifica o elimina un registro de ronda o de cirugía.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DailySurgeryRecord, RoundEntry
+
+# Clave de caché del contexto de la vista de indicadores
+INDICADORES_CACHE_KEY = "indicadores:v1"
+
+
+@receiver(post_save, sender=RoundEntry)
+@receiver(post_delete, sender=RoundEntry)
+@receiver(post_save, sender=DailySurgeryRecord)
+@receiver(post_delete, sender=DailySurgeryRecord)
+def invalidar_indicadores(sender, **kwargs):
+    """Descarta los indicadores en caché para que se recalculen."""
+    cache.delete(INDICADORES_CACHE_KEY)
@@ -1,3 +1,24 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .festivos_colombia import obtener_festivos_mes
+
+
+class ObtenerFestivosMesTests(SimpleTestCase):
+    """Festivos que la Ley Emiliani traslada al mismo lunes."""
+
+    def test_festivos_en_el_mismo_lunes_no_se_duplican(self):
+        # 2025: Sagrado Corazón y San Pedro y San Pablo caen el lunes 30 de junio
+        self.assertEqual(
+            obtener_festivos_mes(2025, 6),
+            [date(2025, 6, 2), date(2025, 6, 23), date(2025, 6, 30)],
+        )
+        # 1981: San Pedro y San Pablo y Sagrado Corazón coinciden el 29 de junio
+        self.assertEqual(
+            obtener_festivos_mes(1981, 6),
+            [date(1981, 6, 1), date(1981, 6, 22), date(1981, 6, 29)],
+        )
+
+    def test_mes_sin_coincidencias(self):
+        self.assertEqual(obtener_festivos_mes(2025, 1), [date(2025, 1, 1), date(2025, 1, 6)])
@@ -5,66 +5,85 @@ Este módulo contiene todas las constantes globales, estructuras de datos
 de configuración y funciones auxiliares utilizadas en el sistema de rondas.
 """
 import base64
+import binascii
 import io
-import uuid
+import logging
+import secrets
+from functools import lru_cache
+from types import MappingProxyType
 from django.core.files.base import ContentFile
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
+
+
+logger = logging.getLogger(__name__)
 
 
 # ============================================================================
 # SERVICIOS HOSPITALARIOS - CATEGORÍAS
 # ============================================================================
 
-PRIORITARIOS = [
+# Las constantes de configuración son inmutables (tuplas y
+# MappingProxyType): se comparten entre peticiones y no deben modificarse.
+
+PRIORITARIOS = (
     "UNIDAD DE RECIÉN NACIDOS (CUIDADOS INTERMEDIOS)",
     "UNIDAD DE RECIÉN NACIDOS (CUIDADOS INTENSIVOS)",
     "UNIDAD DE CUIDADOS INTENSIVOS",
     "UNIDAD DE CUIDADO INTENSIVO PEDIÁTRICO",
-]
+)
 
-SEDES_EXTERNAS = [
+SEDES_EXTERNAS = (
     "Cuidados Paliativos",
     "Intelectus",
-]
+)
+
+# Servicios que usan el formulario de Oncología (nombres en minúsculas, con
+# y sin tilde)
+ONCOLOGY_SERVICES = frozenset({"oncología", "hemato-oncología", "oncologia", "hemato-oncologia"})
 
 
 # ============================================================================
 # SERVICIOS POR DÍA DE LA SEMANA (0=Lunes, 6=Domingo)
 # ============================================================================
 
-RONDA_DIARIA = {
-    0: ["Urgencias", "Salud Mental", "Trasplante de Médula"],
-    1: ["Oftalmología", "Neurociencias", "Patología", "Radiología", "Hospitalización Aislamiento", "Sexto Centro", "Medicina Nuclear"],
-    2: ["Urgencias", "Oncología", "Hemato-Oncología", "Gastroenterología"],
-    3: ["Neumología", "Nefrología", "Cardiología", "Medicina Interna", "Neurología", "Otorrino"],
-    4: ["Urgencias", "Consulta Externa", "Pediatría", "9 Piso"],
-}
-
-SERVICIO_SALAS = {
-    0: ["Hospitalización Cirugía", "Lactario", "Central de Esterilización", "SIPE"],
-    2: ["Central de Esterilización", "Neurociencias", "SIPE"],
-    4: ["Central de Esterilización", "SIPE"],
-}
-
-LABORATORIO_CLINICO = {
-    0: [  # Lunes - todos los servicios
+RONDA_DIARIA = MappingProxyType({
+    0: ("Urgencias", "Salud Mental", "Trasplante de Médula"),
+    1: ("Oftalmología", "Neurociencias", "Patología", "Radiología", "Hospitalización Aislamiento", "Sexto Centro", "Medicina Nuclear"),
+    2: ("Urgencias", "Oncología", "Hemato-Oncología", "Gastroenterología"),
+    3: ("Neumología", "Nefrología", "Cardiología", "Medicina Interna", "Neurología", "Otorrino"),
+    4: ("Urgencias", "Consulta Externa", "Pediatría", "9 Piso"),
+})
+
+SERVICIO_SALAS = MappingProxyType({
+    0: ("Hospitalización Cirugía", "Lactario", "Central de Esterilización", "SIPE"),
+    2: ("Central de Esterilización", "Neurociencias", "SIPE"),
+    4: ("Central de Esterilización", "SIPE"),
+})
+
+LABORATORIO_CLINICO = MappingProxyType({
+    0: (  # Lunes - todos los servicios
         "LC - ALMACÉN", "LC - MICROBIOLOGÍA", "LC - BIOLOGÍA MOLECULAR", "LC - CITOMETRÍA DE FLUJO",
         "LC - INMUNOLOGÍA", "LC - HEMATOLOGÍA", "LC - QUÍMICA", "LC - TAMIZAJE",
         "LC - REFERENCIA Y CONTRAREFERENCIA", "LC - SERVICIO TRANSFUSIONAL", "LC - TOMA DE MUESTRAS", "LC - ERRORES INNATOS"
-    ],
-    1: [  # Martes - solo errores innatos
-        "LC - ERRORES INNATOS"
-    ]
-}
+    ),
+    1: (  # Martes - solo errores innatos
+        "LC - ERRORES INNATOS",
+    ),
+})
+
+
+# Todos los servicios de cada categoría (para mostrar opciones en el frontend)
+ALL_RONDA_DIARIA = tuple(sorted({servicio for servicios_dia in RONDA_DIARIA.values() for servicio in servicios_dia}))
+ALL_SERVICIO_SALAS = tuple(sorted({servicio for servicios_dia in SERVICIO_SALAS.values() for servicio in servicios_dia}))
 
 
 # ============================================================================
 # SALAS DE CIRUGÍA - CONFIGURACIÓN
 # ============================================================================
 
-SURGERY_ROOMS = [str(numero) for numero in range(1, 15)]  # Salas 1-14
+SURGERY_ROOMS = tuple(str(numero) for numero in range(1, 15))  # Salas 1-14
 
-SURGERY_EQUIPMENT = [
+SURGERY_EQUIPMENT = (
     "Máquina",
     "Presión bala de oxígeno (O₂)",
     "Monitor",
@@ -73,19 +92,27 @@ SURGERY_EQUIPMENT = [
     "Electrobisturí",
     "Microscopio",
     "Otros",
-]
+)
 
-SURGERY_DAYS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado"]
+# Equipos de cada sala, calculados una sola vez (el microscopio solo está en
+# la sala 1): tupla de pares (sala, equipos)
+SURGERY_ROOM_EQUIPMENT = tuple(
+    (sala, tuple(equipo for equipo in SURGERY_EQUIPMENT if not (equipo == "Microscopio" and sala != "1")))
+    for sala in SURGERY_ROOMS
+)
+
+SURGERY_DAYS = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado")
 
 # Días en que aparecen las salas de cirugía (0=Lunes, 5=Sábado)
-SURGERY_AVAILABLE_DAYS = [0, 1, 2, 3, 4, 5]  # Lunes a Sábado
+SURGERY_AVAILABLE_DAYS_LIST = (0, 1, 2, 3, 4, 5)  # Lunes a Sábado, en orden
+SURGERY_AVAILABLE_DAYS = frozenset(SURGERY_AVAILABLE_DAYS_LIST)  # Para verificar pertenencia
 
 
 # ============================================================================
 # DÍAS DE LA SEMANA EN ESPAÑOL
 # ============================================================================
 
-SPANISH_WEEKDAYS = [
+SPANISH_WEEKDAYS = (
     "Lunes",
     "Martes",
     "Miércoles",
@@ -93,41 +120,52 @@ SPANISH_WEEKDAYS = [
     "Viernes",
     "Sábado",
     "Domingo",
-]
+)
 
 
 # ============================================================================
 # ESTRUCTURA DE CATEGORÍAS PARA PLANTILLAS
 # ============================================================================
 
-ROUND_STRUCTURE = {
-    "prioritarios": {
+ROUND_STRUCTURE = MappingProxyType({
+    "prioritarios": MappingProxyType({
         "titulo": "Servicios Prioritarios",
         "descripcion": "Servicios prioritarios siempre disponibles"
-    },
-    "ronda_diaria": {
+    }),
+    "ronda_diaria": MappingProxyType({
         "titulo": "Ronda Diaria",
         "descripcion": "Servicios de ronda diaria según día de la semana"
-    },
-    "servicio_salas": {
+    }),
+    "servicio_salas": MappingProxyType({
         "titulo": "Servicio de Salas", 
         "descripcion": "Servicios dependientes del día"
-    },
-    "laboratorio_clinico": {
+    }),
+    "laboratorio_clinico": MappingProxyType({
         "titulo": "Laboratorio Clínico",
         "descripcion": "Solo disponible los lunes"
-    },
-    "sedes_externas": {
+    }),
+    "sedes_externas": MappingProxyType({
         "titulo": "Sedes Externas",
         "descripcion": "Siempre disponibles"
-    },
-}
+    }),
+})
 
 
 # ============================================================================
 # FUNCIONES AUXILIARES PARA PROCESAMIENTO DE DATOS
 # ============================================================================
 
+# NOTA: base64_to_image_file y process_signature_data no se usan actualmente.
+# Las firmas se guardan como texto data-URI en campos TextField (RoundEntry y
+# DailySurgeryRecord) y ninguna vista las convierte a archivo; estas funciones
+# quedan para un eventual paso a ImageField.
+
+# Parámetros del procesamiento de firmas, resueltos una sola vez al importar
+FIRMA_MAX_SIZE = (800, 600)
+FIRMA_FONDO = (255, 255, 255)
+_MODOS_CON_TRANSPARENCIA = frozenset(('RGBA', 'LA', 'P'))
+_RESAMPLE_FIRMA = Image.Resampling.LANCZOS
+
 
 def base64_to_image_file(base64_string, filename_prefix="firma"):
     """
@@ -136,47 +174,54 @@ def base64_to_image_file(base64_string, filename_prefix="firma"):
     if not base64_string or not base64_string.startswith('data:image'):
         return None
     
+    # Los datos empiezan tras la coma de la cabecera "data:image/...;base64,".
+    # El formato de origen no importa: PIL lo detecta y se guarda como JPEG
+    coma = base64_string.find(',', 0, 64)
+    if coma < 0:
+        return None
+    base64_data = base64_string[coma + 1:]
+    
     try:
-        # Extraer el formato y los datos
-        format_info, base64_data = base64_string.split(';base64,')
-        image_format = format_info.split('/')[-1].lower()
-        
-        # Decodificar base64
-        image_data = base64.b64decode(base64_data)
-        
-        # Crear archivo en memoria
-        image_io = io.BytesIO(image_data)
-        
-        # Abrir con PIL para procesar
-        image = Image.open(image_io)
+        # Decodificar base64 y abrir con PIL directamente sobre el buffer;
+        # load() decodifica la imagen de una vez para liberar los bytes fuente
+        image = Image.open(io.BytesIO(base64.b64decode(base64_data)))
+        image.load()
         
         # Convertir a RGB si es necesario (para PNG con transparencia)
-        if image.mode in ('RGBA', 'LA', 'P'):
-            # Crear fondo blanco
-            background = Image.new('RGB', image.size, (255, 255, 255))
+        if image.mode in _MODOS_CON_TRANSPARENCIA:
             if image.mode == 'P':
                 image = image.convert('RGBA')
-            background.paste(image, mask=image.split()[-1] if image.mode == 'RGBA' else None)
-            image = background
+            if image.mode == 'RGBA' and image.getextrema()[3] == (255, 255):
+                # Alfa totalmente opaco (caso común del canvas de firma):
+                # basta con descartar el canal, sin componer sobre fondo
+                image = image.convert('RGB')
+            else:
+                # Crear fondo blanco
+                background = Image.new('RGB', image.size, FIRMA_FONDO)
+                # getchannel('A') extrae solo el canal alfa, sin copiar los demás
+                mask = image.getchannel('A') if image.mode == 'RGBA' else None
+                background.paste(image, mask=mask)
+                image = background
         
-        # Redimensionar si es muy grande (máximo 800x600)
-        max_size = (800, 600)
-        if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
-            image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        # Redimensionar si es muy grande (máximo 800x600); thumbnail() no
+        # hace nada si la imagen ya cabe en el tamaño máximo
+        image.thumbnail(FIRMA_MAX_SIZE, _RESAMPLE_FIRMA)
         
         # Guardar en BytesIO como JPEG para reducir tamaño
         output_io = io.BytesIO()
         image.save(output_io, format='JPEG', quality=85, optimize=True)
         output_io.seek(0)
         
-        # Crear archivo Django
-        filename = f"{filename_prefix}_{uuid.uuid4().hex[:8]}.jpg"
+        # Crear archivo Django (getvalue() comparte el buffer interno de
+        # BytesIO sin copiarlo)
+        filename = f"{filename_prefix}_{secrets.token_hex(4)}.jpg"
         django_file = ContentFile(output_io.getvalue(), name=filename)
         
         return django_file
         
-    except Exception as e:
-        print(f"Error procesando imagen base64: {e}")
+    except (ValueError, binascii.Error, UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        # Datos base64 o imagen inválidos: se descarta la firma
+        logger.warning("Imagen base64 rechazada (%s)", filename_prefix, exc_info=True)
         return None
 
 
@@ -207,39 +252,35 @@ def process_signature_data(form_data):
     return processed_data
 
 
+@lru_cache(maxsize=8)
 def get_services_for_day(day_number):
     """
     Obtiene todos los servicios disponibles para un día específico.
     
+    El resultado se memoriza por día y se comparte entre llamadas, por eso
+    se devuelve como un mapeo de solo lectura. Quien necesite modificarlo
+    debe copiarlo primero con dict(...).
+    
     Args:
         day_number (int): Número del día (0=Lunes, 6=Domingo)
         
     Returns:
-        dict: Diccionario con todos los servicios organizados por categoría
+        MappingProxyType: Servicios organizados por categoría (solo lectura)
         
     Example:
         >>> servicios = get_services_for_day(0)  # Lunes
         >>> print(servicios["ronda_diaria"])
-        ["Urgencias", "Salud Mental", "Trasplante de Médula"]
+        ("Urgencias", "Salud Mental", "Trasplante de Médula")
     """
     servicios = {
-        "ronda_diaria": RONDA_DIARIA.get(day_number, []),
-        "servicio_salas": SERVICIO_SALAS.get(day_number, []),
-        "laboratorio_clinico": LABORATORIO_CLINICO.get(day_number, []),
+        "ronda_diaria": RONDA_DIARIA.get(day_number, ()),
+        "servicio_salas": SERVICIO_SALAS.get(day_number, ()),
+        "laboratorio_clinico": LABORATORIO_CLINICO.get(day_number, ()),
         "surgery_available": day_number in SURGERY_AVAILABLE_DAYS,
+        # Todos los servicios disponibles (para mostrar opciones en el frontend)
+        "todos_ronda_diaria": ALL_RONDA_DIARIA,
+        "todos_servicio_salas": ALL_SERVICIO_SALAS,
+        "todos_laboratorio_clinico": LABORATORIO_CLINICO[0],  # Todos los servicios de laboratorio
     }
     
-    # Agregar todos los servicios disponibles (para mostrar opciones en el frontend)
-    todos_ronda_diaria = set()
-    todos_servicio_salas = set()
-    
-    for servicios_dia in RONDA_DIARIA.values():
-        todos_ronda_diaria.update(servicios_dia)
-    for servicios_dia in SERVICIO_SALAS.values():
-        todos_servicio_salas.update(servicios_dia)
-    
-    servicios["todos_ronda_diaria"] = sorted(list(todos_ronda_diaria))
-    servicios["todos_servicio_salas"] = sorted(list(todos_servicio_salas))
-    servicios["todos_laboratorio_clinico"] = LABORATORIO_CLINICO[0]  # Todos los servicios de laboratorio
-    
-    return servicios
\ No newline at end of file
+    return MappingProxyType(servicios)
\ No newline at end of file
@@ -7,35 +7,41 @@ edición y eliminación de rondas hospitalarias.
 from django.contrib import messages
 from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required, permission_required
-from django.db.models import Count, Q
-from django.http import HttpResponseNotAllowed, JsonResponse, HttpResponse
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Q, Value
+from django.http import HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse, HttpResponse
 from django.shortcuts import redirect, render, get_object_or_404
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 from django.utils import timezone
-from datetime import datetime, date
 
-from .forms import RoundEntryForm, OncologyRoundEntryForm, DailySurgeryRoundForm
+from .forms import RoundEntryForm, OncologyRoundEntryForm, DailySurgeryRoundForm, formulario_sin_datos
 from .models import RoundEntry, DailySurgeryRecord
 from .festivos_colombia import obtener_dia_rondas, es_dia_festivo
 from .helpers import (
     is_oncology_service,
     horario_valido_panel,
-    horario_visible_historial,
+    filtro_horario_historial,
     surgery_available_today,
     get_services_by_day
 )
 from .exports import exportar_historial_pdf, exportar_historial_excel
+from .signals import INDICADORES_CACHE_KEY
 from .utils import (
     PRIORITARIOS,
     SEDES_EXTERNAS,
-    SURGERY_ROOMS,
-    SURGERY_EQUIPMENT,
+    SURGERY_ROOM_EQUIPMENT,
     SURGERY_DAYS,
     SURGERY_AVAILABLE_DAYS,
+    SURGERY_AVAILABLE_DAYS_LIST,
     ROUND_STRUCTURE,
     SPANISH_WEEKDAYS,
 )
 
+# Registros del historial mostrados por página
+REGISTROS_POR_PAGINA = 50
+
 
 @login_required
 @permission_required('rondas.delete_roundentry', raise_exception=True)
@@ -43,14 +49,13 @@ from .utils import (
 def eliminar_registro(request, registro_id):
     """Elimina un registro de ronda."""
     try:
-        registro = get_object_or_404(RoundEntry, id=registro_id)
+        registro = get_object_or_404(RoundEntry.objects.sin_firmas(), id=registro_id)
         nombre_registro = f"{registro.get_categoria_display()} - {registro.subservicio}"
         registro.delete()
         
-        messages.success(request, f"Registro '{nombre_registro}' eliminado correctamente.")
-        return JsonResponse({'success': True, 'message': 'Registro eliminado correctamente'})
+        # Endpoint JSON: el mensaje lo muestra el historial, sin escribir en la sesión
+        return JsonResponse({'success': True, 'message': f"Registro '{nombre_registro}' eliminado correctamente."})
     except Exception as e:
-        messages.error(request, f"Error al eliminar el registro: {str(e)}")
         return JsonResponse({'success': False, 'error': str(e)})
 
 
@@ -60,23 +65,27 @@ def eliminar_registro(request, registro_id):
 def eliminar_registro_cirugia(request, registro_id):
     """Vista para eliminar un registro de cirugía diario (solo administradores)"""
     try:
-        registro = get_object_or_404(DailySurgeryRecord, id=registro_id)
+        registro = get_object_or_404(DailySurgeryRecord.objects.sin_firmas(), id=registro_id)
         fecha_registro = registro.fecha.strftime('%d/%m/%Y')
         registro.delete()
         
-        messages.success(request, f"Registro de cirugía del {fecha_registro} eliminado correctamente.")
-        return JsonResponse({'success': True, 'message': 'Registro de cirugía eliminado correctamente'})
+        # Endpoint JSON: el mensaje lo muestra el historial, sin escribir en la sesión
+        return JsonResponse({'success': True, 'message': f"Registro de cirugía del {fecha_registro} eliminado correctamente."})
     except Exception as e:
-        messages.error(request, f"Error al eliminar el registro de cirugía: {str(e)}")
         return JsonResponse({'success': False, 'error': str(e)})
 
 
 @login_required
 def editar_registro(request, registro_id):
     """Permite editar un registro existente."""
-    registro = get_object_or_404(RoundEntry, id=registro_id)
+    # Solo se cargan las columnas que edita el formulario (se omiten, entre
+    # otras, las firmas 2 y 3 de Oncología)
+    registro = get_object_or_404(
+        RoundEntry.objects.only("usuario", *RoundEntryForm._meta.fields),
+        id=registro_id,
+    )
 
-    if registro.usuario != request.user and not request.user.has_perm('rondas.change_roundentry'):
+    if registro.usuario_id != request.user.id and not request.user.has_perm('rondas.change_roundentry'):
         messages.error(request, 'No tienes permisos para editar este registro. Solo puedes editar los registros que tú creaste o usuarios con permiso de edición pueden hacerlo.')
         return redirect('historial_servicios')
 
@@ -84,7 +93,7 @@ def editar_registro(request, registro_id):
         form = RoundEntryForm(request.POST, instance=registro)
         if form.is_valid():
             registro_actualizado = form.save(commit=False)
-            registro_actualizado.usuario = registro.usuario
+            registro_actualizado.usuario_id = registro.usuario_id
             registro_actualizado.save()
 
             messages.success(request, 'Registro actualizado correctamente.')
@@ -110,7 +119,7 @@ def editar_registro_cirugia(request, registro_id):
     """
     registro = get_object_or_404(DailySurgeryRecord, id=registro_id)
 
-    if registro.usuario != request.user and not request.user.has_perm('rondas.change_dailysurgeryrecord'):
+    if registro.usuario_id != request.user.id and not request.user.has_perm('rondas.change_dailysurgeryrecord'):
         messages.error(request, 'No tienes permisos para editar este registro. Solo puedes editar los registros que tú creaste o usuarios con permiso de edición pueden hacerlo.')
         return redirect('historial_servicios')
 
@@ -118,7 +127,7 @@ def editar_registro_cirugia(request, registro_id):
         form = DailySurgeryRoundForm(request.POST, instance=registro)
         if form.is_valid():
             registro_actualizado = form.save(commit=False)
-            registro_actualizado.usuario = registro.usuario
+            registro_actualizado.usuario_id = registro.usuario_id
             registro_actualizado.save()
 
             messages.success(request, 'Registro de cirugía actualizado correctamente.')
@@ -148,7 +157,7 @@ def logout_redirect(request):
     if request.method not in ("GET", "POST"):
         return HttpResponseNotAllowed(["GET", "POST"])
     logout(request)
-    return redirect("http://127.0.0.1:8000/")
+    return HttpResponseRedirect(reverse("login"))
 
 
 @login_required
@@ -176,6 +185,7 @@ def panel_principal(request):
         day = fecha_rondas.weekday()
         dia_actual = f"{SPANISH_WEEKDAYS[ahora.weekday()]} (trasladado por festivo a {SPANISH_WEEKDAYS[day]})"
         es_dia_festivo_hoy = True
+        servicios = get_services_by_day(day)
     elif ayer_fue_festivo:
         # Si ayer fue festivo, mostrar los servicios de ayer también
         day_anterior = fecha_ayer.weekday()
@@ -183,18 +193,18 @@ def panel_principal(request):
         dia_actual = f"{SPANISH_WEEKDAYS[day]} (incluye servicios del {SPANISH_WEEKDAYS[day_anterior]} festivo)"
         es_dia_festivo_hoy = False
         # Combinar servicios del día actual y del día festivo anterior
-        servicios = get_services_by_day(day)
+        # (copia: get_services_by_day devuelve un mapeo compartido de solo lectura)
+        servicios = dict(get_services_by_day(day))
         servicios_ayer = get_services_by_day(day_anterior)
-        # Combinar las listas sin duplicados
+        # Combinar las listas sin duplicados, conservando el orden: primero
+        # los servicios de hoy y luego los del festivo anterior
         for key in ["ronda_diaria", "servicio_salas", "laboratorio_clinico"]:
             if key in servicios and key in servicios_ayer:
-                servicios[key] = list(set(servicios[key] + servicios_ayer[key]))
+                servicios[key] = list(dict.fromkeys(servicios[key] + servicios_ayer[key]))
     else:
         day = ahora.weekday()
-        dia_actual = SPANISH_WEEKDAYS[ahora.weekday()]
+        dia_actual = SPANISH_WEEKDAYS[day]
         es_dia_festivo_hoy = False
-    
-    if not (dia_ajustado or ayer_fue_festivo):
         servicios = get_services_by_day(day)
 
     # Formularios y lógica original
@@ -210,10 +220,8 @@ def panel_principal(request):
             
             # Usar formulario correcto según el servicio
             subservicio = request.POST.get("subservicio", "")
-            if is_oncology_service(subservicio):
-                round_form = OncologyRoundEntryForm(request.POST)
-            else:
-                round_form = RoundEntryForm(request.POST)
+            form_class = OncologyRoundEntryForm if is_oncology_service(subservicio) else RoundEntryForm
+            round_form = form_class(request.POST)
             
             if round_form.is_valid():
                 registro = round_form.save(commit=False)
@@ -236,113 +244,41 @@ def panel_principal(request):
     current_day_name = None
     
     if servicios.get("surgery_available", False):
-        current_day_name = SURGERY_DAYS[datetime.now().weekday()]
-        
-        for sala in SURGERY_ROOMS:
-            equipos = [
-                equipo
-                for equipo in SURGERY_EQUIPMENT
-                if not (equipo == "Microscopio" and sala != "1")
-            ]
-            surgery_layout.append({"sala": sala, "equipos": equipos})
-
-    # Crear estructura de categorías para el template
-    categories = []
-    
-    # Servicios prioritarios (siempre disponibles)
-    if PRIORITARIOS:
-        prioritarios_forms = []
-        for servicio in PRIORITARIOS:
-            form_key = ("prioritarios", servicio)
-            form = RoundEntryForm(initial={"categoria": "prioritarios", "subservicio": servicio})
-            if posted_key == form_key and posted_form:
-                form = posted_form
-            prioritarios_forms.append({"nombre": servicio, "form": form})
-        
-        categories.append({
-            "clave": "prioritarios",
-            "titulo": "🚨 Servicios Prioritarios (Siempre disponibles)",
-            "subservicios": prioritarios_forms
-        })
-    
-    # Rondas diarias (según día)
-    if servicios.get("ronda_diaria"):
-        ronda_diaria_forms = []
-        for servicio in servicios["ronda_diaria"]:
-            form_key = ("ronda_diaria", servicio)
-            # Usar formulario especial para Oncología
-            if is_oncology_service(servicio):
-                form = OncologyRoundEntryForm(initial={"categoria": "ronda_diaria", "subservicio": servicio})
-            else:
-                form = RoundEntryForm(initial={"categoria": "ronda_diaria", "subservicio": servicio})
-            if posted_key == form_key and posted_form:
-                form = posted_form
-            ronda_diaria_forms.append({"nombre": servicio, "form": form, "is_oncology": is_oncology_service(servicio)})
-        
-        categories.append({
-            "clave": "ronda_diaria",
-            "titulo": f"📅 Ronda Diaria - {dia_actual}",
-            "subservicios": ronda_diaria_forms
-        })
-    
-    # Servicios de salas (según día)
-    if servicios.get("servicio_salas"):
-        servicio_salas_forms = []
-        for servicio in servicios["servicio_salas"]:
-            form_key = ("servicio_salas", servicio)
-            # Usar formulario especial para Oncología
-            if is_oncology_service(servicio):
-                form = OncologyRoundEntryForm(initial={"categoria": "servicio_salas", "subservicio": servicio})
-            else:
-                form = RoundEntryForm(initial={"categoria": "servicio_salas", "subservicio": servicio})
-            if posted_key == form_key and posted_form:
-                form = posted_form
-            servicio_salas_forms.append({"nombre": servicio, "form": form, "is_oncology": is_oncology_service(servicio)})
-        
-        categories.append({
-            "clave": "servicio_salas",
-            "titulo": f"🏥 Servicio de Salas - {dia_actual}",
-            "subservicios": servicio_salas_forms
-        })
+        current_day_name = SURGERY_DAYS[ahora.weekday()]
+        surgery_layout = [
+            {"sala": sala, "equipos": equipos}
+            for sala, equipos in SURGERY_ROOM_EQUIPMENT
+        ]
+
+    # Crear estructura de categorías para el template: (clave, servicios, título)
+    categorias_panel = (
+        ("prioritarios", PRIORITARIOS, "🚨 Servicios Prioritarios (Siempre disponibles)"),
+        ("ronda_diaria", servicios.get("ronda_diaria"), f"📅 Ronda Diaria - {dia_actual}"),
+        ("servicio_salas", servicios.get("servicio_salas"), f"🏥 Servicio de Salas - {dia_actual}"),
+        ("laboratorio_clinico", servicios.get("laboratorio_clinico"), "🧪 Laboratorio Clínico (Solo Lunes)"),
+        ("sedes_externas", SEDES_EXTERNAS, "🏢 Sedes Externas (Siempre disponibles)"),
+    )
     
-    # Laboratorio clínico (solo lunes)
-    if servicios.get("laboratorio_clinico"):
-        lab_forms = []
-        for servicio in servicios["laboratorio_clinico"]:
-            form_key = ("laboratorio_clinico", servicio)
-            # Usar formulario especial para Oncología
-            if is_oncology_service(servicio):
-                form = OncologyRoundEntryForm(initial={"categoria": "laboratorio_clinico", "subservicio": servicio})
-            else:
-                form = RoundEntryForm(initial={"categoria": "laboratorio_clinico", "subservicio": servicio})
-            if posted_key == form_key and posted_form:
+    categories = []
+    for clave, servicios_categoria, titulo in categorias_panel:
+        if not servicios_categoria:
+            continue
+        subservicios = []
+        for servicio in servicios_categoria:
+            is_oncology = is_oncology_service(servicio)
+            if posted_form is not None and posted_key == (clave, servicio):
+                # Formulario enviado con errores: se muestra con sus datos
                 form = posted_form
-            lab_forms.append({"nombre": servicio, "form": form, "is_oncology": is_oncology_service(servicio)})
-        
-        categories.append({
-            "clave": "laboratorio_clinico",
-            "titulo": "🧪 Laboratorio Clínico (Solo Lunes)",
-            "subservicios": lab_forms
-        })
-    
-    # Sedes externas (siempre disponibles)
-    if SEDES_EXTERNAS:
-        sedes_forms = []
-        for servicio in SEDES_EXTERNAS:
-            form_key = ("sedes_externas", servicio)
-            # Usar formulario especial para Oncología
-            if is_oncology_service(servicio):
-                form = OncologyRoundEntryForm(initial={"categoria": "sedes_externas", "subservicio": servicio})
             else:
-                form = RoundEntryForm(initial={"categoria": "sedes_externas", "subservicio": servicio})
-            if posted_key == form_key and posted_form:
-                form = posted_form
-            sedes_forms.append({"nombre": servicio, "form": form, "is_oncology": is_oncology_service(servicio)})
+                # Usar formulario especial para Oncología
+                form_class = OncologyRoundEntryForm if is_oncology else RoundEntryForm
+                form = formulario_sin_datos(form_class, {"categoria": clave, "subservicio": servicio})
+            subservicios.append({"nombre": servicio, "form": form, "is_oncology": is_oncology})
         
         categories.append({
-            "clave": "sedes_externas",
-            "titulo": "🏢 Sedes Externas (Siempre disponibles)",
-            "subservicios": sedes_forms
+            "clave": clave,
+            "titulo": titulo,
+            "subservicios": subservicios,
         })
 
     contexto = {
@@ -352,11 +288,13 @@ def panel_principal(request):
         "fecha_rondas": fecha_rondas,
         "fecha_original": fecha_hoy,
         "categories": categories,
+        # Categoría del formulario enviado con errores (se pinta sin caché)
+        "categoria_enviada": posted_key[0] if posted_form is not None else None,
         "surgery_days": [current_day_name] if current_day_name else [],
         "current_day_name": current_day_name,
         "surgery_layout": surgery_layout,
         "surgery_available": servicios.get("surgery_available", False) and day in SURGERY_AVAILABLE_DAYS,
-        "surgery_available_days": [SPANISH_WEEKDAYS[day] for day in SURGERY_AVAILABLE_DAYS],
+        "surgery_available_days": [SPANISH_WEEKDAYS[day] for day in SURGERY_AVAILABLE_DAYS_LIST],
     }
     return render(request, "rondas/panel.html", contexto)
 
@@ -369,12 +307,11 @@ def historial_servicios(request):
     - Combina rondas de servicios regulares y cirugías
     - Permite filtrar por categoría y subservicio
     """
-    from itertools import chain
-    from operator import attrgetter
-    import json
+    # Solo registros creados entre 5am y 6pm (filtrado en la base de datos)
+    horario_visible = filtro_horario_historial()
     
-    # Obtener registros de servicios
-    registros_servicios = RoundEntry.objects.select_related("usuario")
+    # Filtrar registros de servicios
+    registros_servicios = RoundEntry.objects.filter(horario_visible)
     categoria = request.GET.get("categoria")
     if categoria:
         registros_servicios = registros_servicios.filter(categoria=categoria)
@@ -382,38 +319,44 @@ def historial_servicios(request):
     if subservicio:
         registros_servicios = registros_servicios.filter(subservicio__icontains=subservicio)
     
-    # Obtener registros de cirugías diarias
-    registros_cirugias = DailySurgeryRecord.objects.select_related("usuario")
+    # Registros de cirugías diarias
+    registros_cirugias = DailySurgeryRecord.objects.filter(horario_visible)
     
-    # Filtrar registros por horario (5am a 6pm)
-    from django.utils import timezone
-    registros_servicios_filtrados = [
-        r for r in registros_servicios 
-        if horario_visible_historial(timezone.localtime(r.fecha_creacion))
-    ]
-    registros_cirugias_filtrados = [
-        r for r in registros_cirugias 
-        if horario_visible_historial(timezone.localtime(r.fecha_creacion))
-    ]
+    # Combinar ambos tipos de registros y ordenarlos por fecha en SQL: un
+    # UNION ALL de claves (tipo, id, fecha) evita ordenar los objetos en Python
+    claves_historial = (
+        registros_servicios.annotate(tipo=Value("servicio"))
+        .values_list("tipo", "id", "fecha_creacion")
+        .union(
+            registros_cirugias.annotate(tipo=Value("cirugia"))
+            .values_list("tipo", "id", "fecha_creacion"),
+            all=True,
+        )
+        .order_by("-fecha_creacion")
+    )
     
-    # Combinar ambos tipos de registros y ordenar por fecha
-    registros_combinados = list(chain(registros_servicios_filtrados, registros_cirugias_filtrados))
-    registros = sorted(registros_combinados, key=attrgetter('fecha_creacion'), reverse=True)
-
-    # Para soportar hasta 4 firmas de jefes (Oncología/CJO) almacenadas en
-    # el campo `firma_servicio` como JSON (lista de dicts {"name":..., "img":...}).
-    # Normalizamos añadiendo un atributo dinámico `jefe_firmas` a cada registro
-    for r in registros:
-        r.jefe_firmas = None
-        try:
-            if r.firma_servicio and isinstance(r.firma_servicio, str) and r.firma_servicio.strip().startswith('['):
-                parsed = json.loads(r.firma_servicio)
-                if isinstance(parsed, list) and parsed:
-                    # Cada item esperado: {'name': 'Jefe 1', 'img': 'data:image/png;base64,...'}
-                    r.jefe_firmas = parsed[:4]
-        except Exception:
-            # Si no es JSON válido, ignorar y dejar jefe_firmas = None
-            r.jefe_firmas = None
+    # Paginar las claves: la consulta lleva LIMIT/OFFSET y solo se cargan
+    # (y se procesan) los registros de la página solicitada
+    page_obj = Paginator(claves_historial, REGISTROS_POR_PAGINA).get_page(request.GET.get("page"))
+    claves = page_obj.object_list
+    
+    # Cargar los objetos de cada modelo solo con las columnas que pinta la
+    # plantilla; las firmas 2 y 3 de Oncología (base64 de varios KB cada una)
+    # no se muestran. Del usuario basta usuario_id, que la plantilla compara
+    # con user.id, así que no hace falta unir la tabla de usuarios
+    servicios_por_id = RoundEntry.objects.only(
+        "usuario", "categoria", "subservicio", "hallazgo", "eventos_seguridad",
+        "placa_equipo", "orden_trabajo", "nombre_encargado_servicio",
+        "nombre_encargado_ronda", "firma_servicio", "firma_ronda", "fecha_creacion",
+    ).in_bulk([id_ for tipo, id_, _ in claves if tipo == "servicio"])
+    cirugias_por_id = DailySurgeryRecord.objects.only(
+        "usuario", "nombre_encargado_servicio", "nombre_encargado_ronda",
+        "firma_servicio", "firma_ronda", "fecha_creacion",
+    ).in_bulk([id_ for tipo, id_, _ in claves if tipo == "cirugia"])
+    registros = [
+        servicios_por_id[id_] if tipo == "servicio" else cirugias_por_id[id_]
+        for tipo, id_, _ in claves
+    ]
 
     # Agregar categorías adicionales que no están en ROUND_STRUCTURE
     categorias_completas = ROUND_STRUCTURE.copy()
@@ -430,78 +373,89 @@ def historial_servicios(request):
         "descripcion": "Registros de rondas de cirugía"
     }
     
+    # Filtros actuales para conservarlos en los enlaces de paginación
+    filtros = request.GET.copy()
+    filtros.pop("page", None)
+    
     return render(
         request,
         "rondas/historial.html",
         {
             "registros": registros,
             "categorias": categorias_completas,
+            "page_obj": page_obj,
+            "filtros_query": filtros.urlencode(),
         },
     )
 
 
 @login_required
 def indicadores(request):
-    totales = list(
-        RoundEntry.objects.values("categoria")
-        .annotate(total=Count("id"), con_novedad=Count("id"))
-        .order_by("categoria")
-    )
-
-    resumen = [
-        {
-            "clave": item["categoria"],
-            "titulo": ROUND_STRUCTURE.get(item["categoria"], {}).get("titulo", item["categoria"].title()),
-            "total": item["total"],
-            "con_novedad": item["con_novedad"],
-        }
-        for item in totales
-    ]
-
-    # Indicadores adicionales
-    equipos_fuera_servicio = RoundEntry.objects.filter(
-        fuera_de_servicio=True
-    ).count()
-    
-    eventos_seguridad = RoundEntry.objects.filter(
-        tiene_eventos_seguridad=True
-    ).count()
+    def calcular_indicadores():
+        # Totales por categoría y conteos de equipos fuera de servicio y eventos
+        # de seguridad, calculados en una sola consulta con agregación condicional
+        totales = list(
+            RoundEntry.objects.values("categoria")
+            .annotate(
+                total=Count("id"),
+                con_novedad=Count("id"),
+                fuera_de_servicio=Count("id", filter=Q(fuera_de_servicio=True)),
+                con_eventos=Count("id", filter=Q(tiene_eventos_seguridad=True)),
+            )
+            .order_by("categoria")
+        )
+
+        resumen = [
+            {
+                "clave": item["categoria"],
+                "titulo": ROUND_STRUCTURE.get(item["categoria"], {}).get("titulo", item["categoria"].title()),
+                "total": item["total"],
+                "con_novedad": item["con_novedad"],
+            }
+            for item in totales
+        ]
+
+        # Indicadores adicionales
+        equipos_fuera_servicio = sum(item["fuera_de_servicio"] for item in totales)
+        eventos_seguridad = sum(item["con_eventos"] for item in totales)
     
-    # Top 5 servicios con más equipos fuera de servicio
-    top_fuera_servicio = list(
-        RoundEntry.objects.filter(fuera_de_servicio=True)
-        .values("subservicio", "categoria")
-        .annotate(total=Count("id"))
-        .order_by("-total")[:5]
-    )
+        # Top 5 servicios con más equipos fuera de servicio
+        top_fuera_servicio = list(
+            RoundEntry.objects.filter(fuera_de_servicio=True)
+            .values("subservicio", "categoria")
+            .annotate(total=Count("id"))
+            .order_by("-total")[:5]
+        )
     
-    # Top 5 servicios con más eventos de seguridad
-    top_eventos_seguridad = list(
-        RoundEntry.objects.filter(tiene_eventos_seguridad=True)
-        .values("subservicio", "categoria")
-        .annotate(total=Count("id"))
-        .order_by("-total")[:5]
-    )
-
-    # Registros diarios de cirugía agrupados por fecha
-    semanal_cirugia = (
-        DailySurgeryRecord.objects.values("fecha")
-        .annotate(total=Count("id"))
-        .order_by("-fecha")[:12]
-    )
-
-    return render(
-        request,
-        "rondas/indicadores.html",
-        {
+        # Top 5 servicios con más eventos de seguridad
+        top_eventos_seguridad = list(
+            RoundEntry.objects.filter(tiene_eventos_seguridad=True)
+            .values("subservicio", "categoria")
+            .annotate(total=Count("id"))
+            .order_by("-total")[:5]
+        )
+
+        # Registros diarios de cirugía agrupados por fecha
+        semanal_cirugia = list(
+            DailySurgeryRecord.objects.values("fecha")
+            .annotate(total=Count("id"))
+            .order_by("-fecha")[:12]
+        )
+
+        return {
             "resumen": resumen,
             "semanal_cirugia": semanal_cirugia,
             "equipos_fuera_servicio": equipos_fuera_servicio,
             "eventos_seguridad": eventos_seguridad,
             "top_fuera_servicio": top_fuera_servicio,
             "top_eventos_seguridad": top_eventos_seguridad,
-        },
-    )
+        }
+
+    # Los indicadores se guardan en caché un minuto; las señales de
+    # rondas/signals.py los descartan al guardar o eliminar registros
+    contexto = cache.get_or_set(INDICADORES_CACHE_KEY, calcular_indicadores, 60)
+
+    return render(request, "rondas/indicadores.html", contexto)
 
 
 # Funciones de exportación definidas en rondas/exports.py